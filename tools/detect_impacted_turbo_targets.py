@@ -9,10 +9,27 @@ Turbo targets (package-name#task).
 
 import argparse
 import json
+import os
+import re
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Set
+from typing import Dict, Iterator, List, Optional, Set
+
+try:
+    import orjson
+except ImportError:  # optional C-accelerated serializer
+    orjson = None
+
+# Matches the first "name": "..." pair in a package.json (JSON string escapes allowed)
+_NAME_RE = re.compile(rb'"name"\s*:\s*"([^"\\]*(?:\\.[^"\\]*)*)"')
+
+# Package directory (e.g. "packages/alpha") of a path relative to the turbo root
+_TURBO_PKG_RE = re.compile(r"^((?:packages|apps)/[^/]+)(?:/|$)")
+
+# npm puts "name" at the top of package.json, so read only the head of the file
+_PKG_JSON_HEAD_BYTES = 4096
 
 
 def find_turbo_workspace_root(repo_root: Path) -> Optional[Path]:
@@ -27,6 +44,47 @@ def find_turbo_workspace_root(repo_root: Path) -> Optional[Path]:
     return None
 
 
+def _iter_package_dirs(turbo_dir: Path) -> Iterator[str]:
+    """
+    Yield the path of every directory directly under packages/ and apps/.
+
+    Uses os.scandir so is_dir() is answered from the directory listing itself
+    rather than a separate stat() per entry.
+    """
+    for parent_dir in (turbo_dir / "packages", turbo_dir / "apps"):
+        try:
+            with os.scandir(parent_dir) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        yield entry.path
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+
+
+def _read_pkg_name(pkg_json: str) -> Optional[str]:
+    """
+    Read the "name" field of a package.json without parsing the whole manifest.
+    Falls back to a full JSON parse if the name isn't found in the file head
+    ahead of any nested object.
+    A missing file yields None, so callers need not check exists() first.
+    """
+    try:
+        with open(pkg_json, "rb") as f:
+            head = f.read(_PKG_JSON_HEAD_BYTES)
+            m = _NAME_RE.search(head)
+            # Only trust the match if no nested object opens before it, so
+            # e.g. "author": {"name": ...} is never taken for the package name
+            nested = head.find(b"{", head.find(b"{") + 1)
+            if m and (nested == -1 or nested > m.start()):
+                # Decode JSON string escapes in the captured value
+                return json.loads(b'"' + m.group(1) + b'"') or None
+            data = json.loads(head + f.read())
+        name = data.get("name") if isinstance(data, dict) else None
+        return name or None
+    except (json.JSONDecodeError, UnicodeDecodeError, IOError):
+        return None
+
+
 def get_all_packages(turbo_dir: Path) -> List[str]:
     """
     Get all packages in the Turbo workspace by reading package.json files.
@@ -34,41 +92,7 @@ def get_all_packages(turbo_dir: Path) -> List[str]:
     Returns:
         List of package names (e.g., ['@mergequeue/alpha', '@mergequeue/bravo'])
     """
-    packages = []
-
-    # Check packages directory
-    packages_dir = turbo_dir / "packages"
-    if packages_dir.exists():
-        for pkg_dir in packages_dir.iterdir():
-            if pkg_dir.is_dir():
-                pkg_json = pkg_dir / "package.json"
-                if pkg_json.exists():
-                    try:
-                        with open(pkg_json, "r", encoding="utf-8") as f:
-                            pkg_data = json.load(f)
-                            pkg_name = pkg_data.get("name")
-                            if pkg_name:
-                                packages.append(pkg_name)
-                    except (json.JSONDecodeError, IOError):
-                        pass
-
-    # Check apps directory
-    apps_dir = turbo_dir / "apps"
-    if apps_dir.exists():
-        for app_dir in apps_dir.iterdir():
-            if app_dir.is_dir():
-                app_json = app_dir / "package.json"
-                if app_json.exists():
-                    try:
-                        with open(app_json, "r", encoding="utf-8") as f:
-                            app_data = json.load(f)
-                            app_name = app_data.get("name")
-                            if app_name:
-                                packages.append(app_name)
-                    except (json.JSONDecodeError, IOError):
-                        pass
-
-    return sorted(packages)
+    return sorted(_index_packages(turbo_dir).values())
 
 
 def get_changed_files(
@@ -95,109 +119,159 @@ def get_changed_files(
         if base and head:
             # Compare two commits
             result = subprocess.run(
-                ["git", "diff", "--name-only", base, head],
+                ["git", "diff", "--name-only", "-z", base, head],
                 capture_output=True,
-                text=True,
                 check=True,
             )
-            changed_files.extend(result.stdout.strip().split("\n"))
+            changed_files.extend(
+                result.stdout.decode("utf-8", "surrogateescape").split("\x00")
+            )
         elif uncommitted:
             # Get uncommitted changes
             result = subprocess.run(
-                ["git", "diff", "--name-only", "HEAD"],
+                ["git", "diff", "--name-only", "-z", "HEAD"],
                 capture_output=True,
-                text=True,
                 check=True,
             )
-            changed_files.extend(result.stdout.strip().split("\n"))
+            changed_files.extend(
+                result.stdout.decode("utf-8", "surrogateescape").split("\x00")
+            )
 
         if untracked:
             # Get untracked files
             result = subprocess.run(
-                ["git", "ls-files", "--others", "--exclude-standard"],
+                [
+                    "git",
+                    "ls-files",
+                    "-z",
+                    "--others",
+                    "--exclude-standard",
+                    "--full-name",
+                ],
                 capture_output=True,
-                text=True,
                 check=True,
             )
-            changed_files.extend(result.stdout.strip().split("\n"))
+            changed_files.extend(
+                result.stdout.decode("utf-8", "surrogateescape").split("\x00")
+            )
 
-        # Filter out empty strings
-        return [f for f in changed_files if f.strip()]
+        # NUL-delimited output: filter out empty entries and dedupe (keeping
+        # order) since diff and ls-files output may overlap
+        return [f for f in dict.fromkeys(changed_files) if f]
 
     except subprocess.CalledProcessError as e:
         print(f"Error running git command: {e}", file=sys.stderr)
         if e.stderr:
-            print(f"Error output: {e.stderr}", file=sys.stderr)
+            print(
+                f"Error output: {e.stderr.decode('utf-8', 'replace')}",
+                file=sys.stderr,
+            )
         return []
 
 
-def map_files_to_packages(changed_files: List[str], turbo_dir: Path) -> Set[str]:
+def _index_packages(turbo_dir: Path) -> Dict[str, str]:
+    """
+    Enumerate packages/ and apps/ once, reading each package.json a single time.
+    Manifests are read concurrently on a bounded thread pool.
+
+    Returns:
+        Dict of package directory (relative to turbo_dir, posix, e.g.
+        "packages/alpha") -> package name
+    """
+    turbo_root = turbo_dir.resolve()
+    pkg_dirs = list(_iter_package_dirs(turbo_root))
+    if not pkg_dirs:
+        return {}
+    # Each manifest read is a blocking open/read that releases the GIL
+    max_workers = min(32, (os.cpu_count() or 4) * 4, len(pkg_dirs))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        names = executor.map(
+            _read_pkg_name, [os.path.join(d, "package.json") for d in pkg_dirs]
+        )
+        return {
+            os.path.relpath(pkg_dir, turbo_root).replace(os.sep, "/"): pkg_name
+            for pkg_dir, pkg_name in zip(pkg_dirs, names)
+            if pkg_name
+        }
+
+
+def _turbo_relative(
+    file_path: str, turbo_root: Path, turbo_prefix: Optional[str]
+) -> Optional[str]:
+    """
+    Posix path of a changed file relative to the turbo workspace root, or None
+    if the file lies outside it. turbo_prefix is the workspace's repo-relative
+    path with a trailing slash ("" when the workspace is the repo root).
+    """
+    if os.path.isabs(file_path):
+        # Only absolute paths (e.g. from --files) need resolving
+        try:
+            return Path(file_path).resolve().relative_to(turbo_root).as_posix()
+        except ValueError:
+            return None
+    # git already emits repo-relative paths; plain string slicing is enough
+    if file_path.startswith("./"):
+        file_path = file_path[2:]
+    if turbo_prefix is None or not file_path.startswith(turbo_prefix):
+        return None
+    return file_path[len(turbo_prefix) :]
+
+
+def map_files_to_packages(
+    changed_files: List[str],
+    turbo_dir: Path,
+    repo_root: Optional[Path] = None,
+    pkg_index: Optional[Dict[str, str]] = None,
+) -> Set[str]:
     """
     Map changed files to affected packages.
 
     Args:
-        changed_files: List of changed file paths
+        changed_files: List of changed file paths (relative to repo_root, as
+            emitted by git, or absolute)
         turbo_dir: Path to turbo workspace root
+        repo_root: Repository root that relative paths are based on
+            (default: current directory)
+        pkg_index: Result of _index_packages(turbo_dir), if the caller
+            already has it
 
     Returns:
         Set of affected package names
     """
     affected_packages = set()
+    turbo_root = turbo_dir.resolve()
+    if pkg_index is None:
+        pkg_index = _index_packages(turbo_root)
 
-    # Normalize turbo_dir path for comparison
-    turbo_dir_str = str(turbo_dir.resolve())
-
-    for file_path in changed_files:
-        if not file_path.strip():
-            continue
+    # Location of the turbo workspace within the repo, for repo-relative paths
+    try:
+        turbo_rel = turbo_root.relative_to((repo_root or Path.cwd()).resolve())
+        turbo_prefix: Optional[str] = (
+            "" if turbo_rel == Path(".") else turbo_rel.as_posix() + "/"
+        )
+    except ValueError:
+        turbo_prefix = None
+
+    rels = [
+        rel
+        for rel in (
+            _turbo_relative(file_path, turbo_root, turbo_prefix)
+            for file_path in changed_files
+            if file_path.strip()
+        )
+        if rel is not None
+    ]
 
-        # Check if file is in turbo workspace
-        full_path = Path(file_path).resolve()
-        if turbo_dir_str not in str(full_path):
-            continue
+    # If turbo.json or root package.json changed, all packages are affected
+    if any(rel in ("turbo.json", "package.json") for rel in rels):
+        return set(pkg_index.values())
 
-        # Try to find which package this file belongs to
-        # Check packages directory
-        packages_dir = turbo_dir / "packages"
-        if packages_dir.exists():
-            for pkg_dir in packages_dir.iterdir():
-                if pkg_dir.is_dir():
-                    pkg_path_str = str(pkg_dir.resolve())
-                    if pkg_path_str in str(full_path):
-                        pkg_json = pkg_dir / "package.json"
-                        if pkg_json.exists():
-                            try:
-                                with open(pkg_json, "r", encoding="utf-8") as f:
-                                    pkg_data = json.load(f)
-                                    pkg_name = pkg_data.get("name")
-                                    if pkg_name:
-                                        affected_packages.add(pkg_name)
-                            except (json.JSONDecodeError, IOError):
-                                pass
-
-        # Check apps directory
-        apps_dir = turbo_dir / "apps"
-        if apps_dir.exists():
-            for app_dir in apps_dir.iterdir():
-                if app_dir.is_dir():
-                    app_path_str = str(app_dir.resolve())
-                    if app_path_str in str(full_path):
-                        app_json = app_dir / "package.json"
-                        if app_json.exists():
-                            try:
-                                with open(app_json, "r", encoding="utf-8") as f:
-                                    app_data = json.load(f)
-                                    app_name = app_data.get("name")
-                                    if app_name:
-                                        affected_packages.add(app_name)
-                            except (json.JSONDecodeError, IOError):
-                                pass
-
-        # Also check if turbo.json or root package.json changed (affects all packages)
-        if "turbo/turbo.json" in file_path or "turbo/package.json" in file_path:
-            # If root config changed, all packages are affected
-            all_packages = get_all_packages(turbo_dir)
-            affected_packages.update(all_packages)
+    for rel in rels:
+        m = _TURBO_PKG_RE.match(rel)
+        if m:
+            pkg_name = pkg_index.get(m.group(1))
+            if pkg_name:
+                affected_packages.add(pkg_name)
 
     return affected_packages
 
@@ -220,6 +294,29 @@ def format_turbo_targets(packages: Set[str], task: str = "build") -> List[str]:
     return targets
 
 
+def _dump_json(obj) -> bytes:
+    """Serialize compactly, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def _write_atomic(output_file: str, data: bytes) -> None:
+    """Write via a temp file and rename, so readers never see a partial file."""
+    tmp_file = output_file + ".tmp"
+    try:
+        with open(tmp_file, "wb") as f:
+            f.write(data)
+        os.replace(tmp_file, output_file)
+    except BaseException:
+        # Don't leave the temp file behind
+        try:
+            os.unlink(tmp_file)
+        except OSError:
+            pass
+        raise
+
+
 def write_impacted_targets_json(
     targets: List[str],
     output_file: str = "impacted_targets_json_tmp",
@@ -228,13 +325,12 @@ def write_impacted_targets_json(
     """
     Write the list of impacted Turbo targets to a JSON file.
     """
-    # Convert to sorted list for consistent output
-    target_list = sorted(list(set(targets)))  # Remove duplicates and sort
+    # format_turbo_targets already yields sorted targets; only drop duplicates
+    target_list = list(dict.fromkeys(targets))
 
     try:
         # Write as JSON array
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(target_list, f)
+        _write_atomic(output_file, _dump_json(target_list))
 
         if verbose:
             print(f"Wrote {len(target_list)} impacted Turbo targets to {output_file}")
@@ -337,7 +433,7 @@ def main():
     # Get changed files
     changed_files = []
     if args.files:
-        changed_files = [f.strip() for f in args.files.split(",")]
+        changed_files = list(dict.fromkeys(f.strip() for f in args.files.split(",")))
     else:
         changed_files = get_changed_files(
             base=args.base if args.base else None,
@@ -356,8 +452,16 @@ def main():
         if changed_files:
             print(f"Found {len(changed_files)} changed files")
 
+    # --files entries are relative to the cwd (git output is repo-relative);
+    # joining leaves absolute entries unchanged
+    if args.files:
+        changed_files = [os.path.join(os.getcwd(), f) for f in changed_files]
+
     # Map files to packages
-    affected_packages = map_files_to_packages(changed_files, turbo_dir)
+    pkg_index = _index_packages(turbo_dir)
+    affected_packages = map_files_to_packages(
+        changed_files, turbo_dir, repo_root, pkg_index
+    )
 
     # Format as Turbo targets
     targets = format_turbo_targets(affected_packages, task=args.task)
@@ -8,96 +8,58 @@ propagates impact to dependents using the dependency graph from uv.lock.
 """
 
 import argparse
+import functools
+import hashlib
 import json
+import os
+import pickle  # nosec B403 - only loads caches this tool wrote itself
 import subprocess  # noqa: B404  # bandit: git is a trusted control-plane tool
 import sys
+import tempfile
+import tomllib
+from collections import deque
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
+try:
+    import orjson
+except ImportError:  # optional C-accelerated serializer
+    orjson = None
 
-def _parse_uv_lock(lock_path: Path) -> tuple[Dict[str, str], Dict[str, List[str]]]:
+# Bump when the shape of the cached load_workspace_packages payload changes
+_CACHE_FORMAT = 3
+
+
+def _parse_uv_lock(
+    lock_path: Path,
+) -> tuple[Dict[str, str], Dict[str, Tuple[str, ...]]]:
     """
-    Parse uv.lock for workspace members without external TOML deps.
+    Parse uv.lock for workspace members using the stdlib TOML parser.
     Returns (path_by_name, dependents) for workspace packages only.
     """
-    # pylint: disable=too-many-branches,too-many-locals,too-many-statements
-    text = lock_path.read_text(encoding="utf-8")
-    members: Set[str] = set()
-    in_manifest_members = False
-    for line in text.splitlines():
-        if line.strip() == "[manifest]":
-            in_manifest_members = False
-        if "members = [" in line or (
-            in_manifest_members and line.strip().startswith('"')
-        ):
-            in_manifest_members = True
-            for part in line.split('"'):
-                if len(part) == 0:
-                    continue
-                name = part.strip(" ,\n")
-                if name and not name.startswith("]"):
-                    members.add(name)
-        if "]" in line and in_manifest_members:
-            in_manifest_members = False
+    data = tomllib.loads(lock_path.read_text(encoding="utf-8"))
+    members: Set[str] = set(data.get("manifest", {}).get("members", []))
     if not members:
         return {}, {}
 
     path_by_name: Dict[str, str] = {}
     deps_by_name: Dict[str, List[str]] = {}
-    current_name: Optional[str] = None
-    current_editable: Optional[str] = None
-    current_deps: List[str] = []
-    in_deps = False
-
-    for line in text.splitlines():
-        stripped = line.strip()
-        if stripped.startswith("[[package]]"):
-            if current_name and current_name in members:
-                path_by_name[current_name] = current_editable or ""
-                deps_by_name[current_name] = [d for d in current_deps if d in members]
-            current_name = None
-            current_editable = None
-            current_deps = []
-            in_deps = False
+    for pkg in data.get("package", []):
+        name = pkg.get("name")
+        if name not in members:
             continue
-        if stripped.startswith('name = "'):
-            current_name = stripped.split('"')[1]
-        # Only take editable from "source = { editable = \"...\" }", not requires-dist
-        if stripped.startswith("source = ") and 'editable = "' in line:
-            for i, part in enumerate(line.split('"')):
-                if i % 2 == 1 and i >= 1:
-                    current_editable = part.rstrip("/")
-                    break
-        if stripped.startswith("dependencies = ["):
-            in_deps = True
-            for part in line.split('"'):
-                if len(part) == 0:
-                    continue
-                name = part.strip(" ,\n")
-                if name and name in members:
-                    current_deps.append(name)
-        elif in_deps:
-            if "]" in line:
-                for part in line.split('"'):
-                    name = part.strip(" ,\n")
-                    if name and name in members:
-                        current_deps.append(name)
-                in_deps = False
-            else:
-                for part in line.split('"'):
-                    name = part.strip(" ,\n")
-                    if name and name in members:
-                        current_deps.append(name)
-
-    if current_name and current_name in members:
-        path_by_name[current_name] = current_editable or ""
-        deps_by_name[current_name] = [d for d in current_deps if d in members]
-
-    dependents: Dict[str, List[str]] = {n: [] for n in path_by_name}
+        # Only take editable from "source = { editable = ... }", not requires-dist
+        path_by_name[name] = pkg.get("source", {}).get("editable", "").rstrip("/")
+        deps_by_name[name] = [
+            d["name"] for d in pkg.get("dependencies", []) if d.get("name") in members
+        ]
+
+    reverse: Dict[str, List[str]] = {n: [] for n in path_by_name}
     for pkg, deps in deps_by_name.items():
         for dep in deps:
-            if dep in dependents:
-                dependents[dep].append(pkg)
+            if dep in reverse:
+                reverse[dep].append(pkg)
+    dependents = {n: tuple(pkgs) for n, pkgs in reverse.items()}
     return path_by_name, dependents
 
 
@@ -128,22 +90,79 @@ def find_uv_workspace(repo_root: Path) -> Optional[Path]:
     return None
 
 
+def _index_dependents(
+    path_by_name: Dict[str, str],
+    dependents: Dict[str, Tuple[str, ...]],
+) -> tuple[List[str], List[List[int]]]:
+    """
+    Number packages 0..N-1 (in path_by_name order) and convert the reverse graph
+    to an adjacency list over those ids.
+    """
+    names = list(path_by_name)
+    idx = {n: i for i, n in enumerate(names)}
+    dep_adj = [[idx[c] for c in dependents.get(n, ()) if c in idx] for n in names]
+    return names, dep_adj
+
+
+def _cache_path(lock_path: Path) -> Path:
+    """Location of the on-disk parse cache for a given uv.lock."""
+    # Per the XDG spec, an empty or relative XDG_CACHE_HOME is ignored
+    xdg_cache = os.environ.get("XDG_CACHE_HOME")
+    if xdg_cache and os.path.isabs(xdg_cache):
+        cache_root = Path(xdg_cache)
+    else:
+        cache_root = Path.home() / ".cache"
+    digest = hashlib.sha1(str(lock_path).encode(), usedforsecurity=False).hexdigest()
+    return cache_root / "mergequeue" / f"uvlock-{digest}.pkl"
+
+
 def load_workspace_packages(
     repo_root: Path,
-) -> tuple[Dict[str, str], Dict[str, List[str]]]:
+) -> tuple[Dict[str, str], List[str], List[List[int]]]:
     """
     Parse uv.lock for workspace members: package name -> editable path (relative to repo),
-    and dependency graph: package name -> list of direct workspace dependency names.
+    and the reverse dependency graph over those packages.
 
     Returns:
-        (path_by_name, dependents)
+        (path_by_name, names, dep_adj)
         path_by_name: e.g. {"uv-alpha": "uv/lib/alpha", ...}
-        dependents: reverse graph, e.g. {"uv-common": ["uv-alpha", "uv-bravo", ...]}
+        names: package names indexed by integer id
+        dep_adj: for each id, the ids of its direct workspace dependents
+
+    The parse result is cached under $XDG_CACHE_HOME/mergequeue (default
+    ~/.cache/mergequeue), keyed on the lock file's mtime and size.
     """
     lock_path = repo_root / "uv.lock"
     if not lock_path.exists():
-        return {}, {}
-    return _parse_uv_lock(lock_path)
+        return {}, [], []
+
+    # Reuse the previous parse while uv.lock is unchanged (same mtime and size)
+    st = lock_path.stat()
+    key = (_CACHE_FORMAT, st.st_mtime_ns, st.st_size)
+    cache_file = _cache_path(lock_path.resolve())
+    try:
+        with open(cache_file, "rb") as f:
+            cached_key, payload = pickle.load(f)  # nosec B301
+        if cached_key == key:
+            return payload
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError):
+        pass
+
+    path_by_name, dependents = _parse_uv_lock(lock_path)
+    payload = (path_by_name, *_index_dependents(path_by_name, dependents))
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=cache_file.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump((key, payload), f)
+            os.replace(tmp_name, cache_file)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+    except OSError:
+        pass
+    return payload
 
 
 def get_changed_files(
@@ -153,48 +172,72 @@ def get_changed_files(
     untracked: bool = False,
 ) -> List[str]:
     """Get list of changed file paths via git diff."""
-    changed = []
+    changed: List[str] = []
     try:
         if base and head:
             result = (
                 subprocess.run(  # noqa: B603,B607  # nosec B603,B607 - git from PATH
-                    ["git", "diff", "--name-only", base, head],
+                    ["git", "diff", "--name-only", "-z", base, head],
                     capture_output=True,
-                    text=True,
                     check=True,
                 )
             )
-            changed.extend(result.stdout.strip().split("\n"))
+            changed.extend(
+                result.stdout.decode("utf-8", "surrogateescape").split("\x00")
+            )
         elif uncommitted:
             result = (
                 subprocess.run(  # noqa: B603,B607  # nosec B603,B607 - git from PATH
-                    ["git", "diff", "--name-only", "HEAD"],
+                    ["git", "diff", "--name-only", "-z", "HEAD"],
                     capture_output=True,
-                    text=True,
                     check=True,
                 )
             )
-            changed.extend(result.stdout.strip().split("\n"))
+            changed.extend(
+                result.stdout.decode("utf-8", "surrogateescape").split("\x00")
+            )
 
         if untracked:
             result = (
                 subprocess.run(  # noqa: B603,B607  # nosec B603,B607 - git from PATH
-                    ["git", "ls-files", "--others", "--exclude-standard"],
+                    [
+                        "git",
+                        "ls-files",
+                        "-z",
+                        "--others",
+                        "--exclude-standard",
+                        "--full-name",
+                    ],
                     capture_output=True,
-                    text=True,
                     check=True,
                 )
             )
-            changed.extend(result.stdout.strip().split("\n"))
+            changed.extend(
+                result.stdout.decode("utf-8", "surrogateescape").split("\x00")
+            )
 
-        return [f.strip() for f in changed if f.strip()]
+        # NUL-delimited, so names are taken verbatim (no stripping); dedupe
+        # while keeping order since diff and ls-files output may overlap
+        return [f for f in dict.fromkeys(changed) if f]
     except subprocess.CalledProcessError as e:
         print(f"Error running git command: {e}", file=sys.stderr)
         if e.stderr:
-            print(e.stderr, file=sys.stderr)
+            print(e.stderr.decode("utf-8", "replace"), file=sys.stderr)
         return []
 
 
+def _repo_relative(file_path: str, root: Path) -> Optional[str]:
+    """Posix path of a changed file relative to the repo root, or None if outside."""
+    if os.path.isabs(file_path):
+        # Only absolute paths (e.g. from --files) need resolving
+        try:
+            return Path(file_path).resolve().relative_to(root).as_posix()
+        except (OSError, ValueError):
+            return None
+    # git already emits repo-relative paths; no filesystem access needed
+    return file_path[2:] if file_path.startswith("./") else file_path
+
+
 def map_files_to_directly_changed_packages(
     changed_files: List[str],
     path_by_name: Dict[str, str],
@@ -205,63 +248,103 @@ def map_files_to_directly_changed_packages(
     Root pyproject.toml or uv.lock triggers all packages.
     """
     directly_changed: Set[str] = set()
-    root_str = str(repo_root.resolve())
-
-    for f in changed_files:
-        if not f.strip():
-            continue
-        path = Path(f).resolve()
-        try:
-            path_str = str(path)
-        except OSError:
-            continue
-        if root_str not in path_str:
-            continue
-        try:
-            rel = path.relative_to(repo_root)
-        except ValueError:
-            continue
-        rel_str = str(rel).replace("\\", "/")
-
-        if rel_str in ("pyproject.toml", "uv.lock"):
-            directly_changed.update(path_by_name.keys())
-            continue
+    by_dir = {pkg_dir: name for name, pkg_dir in path_by_name.items() if pkg_dir}
+    root = repo_root.resolve()
+
+    rels = [
+        rel
+        for rel in (_repo_relative(f, root) for f in changed_files if f.strip())
+        if rel is not None
+    ]
+    if any(rel in ("pyproject.toml", "uv.lock") for rel in rels):
+        return set(path_by_name.keys())
+
+    for rel_str in rels:
         if rel_str.startswith("uv/"):
-            for name, pkg_dir in path_by_name.items():
-                if not pkg_dir:
-                    continue
-                if rel_str == pkg_dir or rel_str.startswith(pkg_dir + "/"):
-                    directly_changed.add(name)
+            # Nearest enclosing package directory wins (string ops, no Path)
+            anc = rel_str
+            while anc:
+                if anc in by_dir:
+                    directly_changed.add(by_dir[anc])
                     break
+                anc = anc.rpartition("/")[0]
 
     return directly_changed
 
 
-def propagate_to_dependents(
-    directly_changed: Set[str],
-    dependents: Dict[str, List[str]],
-) -> Set[str]:
-    """Return directly changed packages plus all dependents (BFS)."""
-    impacted = set(directly_changed)
-    queue = list(directly_changed)
+# Reverse graph (dep_adj) that the memoized _closure results belong to
+_closure_graph: List[List[int]] = []
+
+
+@functools.lru_cache(maxsize=None)
+def _closure(pkg_id: int) -> int:
+    """Bitmask of pkg_id plus every package that transitively depends on it."""
+    seen = bytearray(len(_closure_graph))
+    seen[pkg_id] = 1
+    visited = [pkg_id]
+    queue = deque(visited)
     while queue:
-        pkg = queue.pop()
-        for dep in dependents.get(pkg, []):
-            if dep not in impacted:
-                impacted.add(dep)
+        for dep in _closure_graph[queue.popleft()]:
+            if not seen[dep]:
+                seen[dep] = 1
+                visited.append(dep)
                 queue.append(dep)
-    return impacted
+    return sum(1 << i for i in visited)
+
+
+def propagate_to_dependents(
+    directly_changed_ids: Iterable[int],
+    names: List[str],
+    dep_adj: List[List[int]],
+) -> Set[str]:
+    """
+    Return directly changed packages plus all dependents.
+
+    Per-package transitive closures are memoized as bitmasks, so repeated calls
+    against the same graph (e.g. when used as a library) reduce to ORs.
+    """
+    global _closure_graph  # pylint: disable=global-statement
+    if dep_adj is not _closure_graph:
+        _closure_graph = dep_adj
+        _closure.cache_clear()
+    mask = 0
+    for i in directly_changed_ids:
+        mask |= _closure(i)
+    # bin() is most-significant first; reverse it so index == package id
+    return {names[i] for i, bit in enumerate(bin(mask)[:1:-1]) if bit == "1"}
+
+
+def _dump_json(obj) -> bytes:
+    """Serialize compactly, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def _write_atomic(output_file: str, data: bytes) -> None:
+    """Write via a temp file and rename, so readers never see a partial file."""
+    tmp_file = output_file + ".tmp"
+    try:
+        with open(tmp_file, "wb") as f:
+            f.write(data)
+        os.replace(tmp_file, output_file)
+    except BaseException:
+        # Don't leave the temp file behind
+        try:
+            os.unlink(tmp_file)
+        except OSError:
+            pass
+        raise
 
 
 def write_impacted_targets_json(
-    targets: List[str],
+    targets: Iterable[str],
     output_file: str,
     verbose: bool = True,
 ) -> None:
     """Write JSON array of impacted package names to file."""
     target_list = sorted(set(targets))
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(target_list, f)
+    _write_atomic(output_file, _dump_json(target_list))
     if verbose:
         print(f"Wrote {len(target_list)} impacted UV targets to {output_file}")
         if target_list:
@@ -332,16 +415,13 @@ def main() -> None:
         )
         sys.exit(1)
 
-    path_by_name, dependents = load_workspace_packages(workspace_root)
-    if not path_by_name:
-        print("Error: No workspace members found in uv.lock", file=sys.stderr)
-        sys.exit(1)
-
     if not args.quiet:
         print(f"Using UV workspace at: {workspace_root}")
 
     if args.files:
-        changed_files = [f.strip() for f in args.files.split(",") if f.strip()]
+        changed_files = list(
+            dict.fromkeys(f.strip() for f in args.files.split(",") if f.strip())
+        )
     else:
         changed_files = get_changed_files(
             base=args.base if args.base else None,
@@ -360,11 +440,33 @@ def main() -> None:
         if changed_files:
             print(f"Found {len(changed_files)} changed files")
 
+    # --files entries are relative to the cwd (git output is repo-relative);
+    # joining leaves absolute entries unchanged
+    if args.files:
+        changed_files = [os.path.join(os.getcwd(), f) for f in changed_files]
+
+    # Only parse uv.lock if something under uv/ or a root manifest changed
+    root = workspace_root.resolve()
+    relevant = any(
+        rel in ("pyproject.toml", "uv.lock") or rel.startswith("uv/")
+        for rel in (_repo_relative(f, root) for f in changed_files)
+        if rel is not None
+    )
+    if not relevant:
+        write_impacted_targets_json([], args.output, verbose=not args.quiet)
+        return
+
+    path_by_name, names, dep_adj = load_workspace_packages(workspace_root)
+    if not path_by_name:
+        print("Error: No workspace members found in uv.lock", file=sys.stderr)
+        sys.exit(1)
+
     directly_changed = map_files_to_directly_changed_packages(
         changed_files, path_by_name, workspace_root
     )
-    impacted = propagate_to_dependents(directly_changed, dependents)
-    write_impacted_targets_json(list(impacted), args.output, verbose=not args.quiet)
+    directly_changed_ids = [i for i, n in enumerate(names) if n in directly_changed]
+    impacted = propagate_to_dependents(directly_changed_ids, names, dep_adj)
+    write_impacted_targets_json(impacted, args.output, verbose=not args.quiet)
 
 
 if __name__ == "__main__":
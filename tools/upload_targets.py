@@ -6,15 +6,72 @@ This script reads impacted targets from a JSON file and uploads them to Trunk's
 It's a generic script that works for any build system (Nx, Turbo, Bazel, etc.).
 """
 
+import argparse
+import gzip
 import json
 import os
 import sys
-from typing import Optional
 
+import orjson
 import requests
-import typer
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Shared session: pooled connections, and retries on transient server errors.
+# setImpactedTargets is idempotent, so retrying the POST is safe.
+session = requests.Session()
+session.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=4,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset(["POST"]),
+            raise_on_status=False,
+        ),
+    ),
+)
+session.headers.update({"Content-Type": "application/json"})
+
+# With --gzip, request bodies larger than this are compressed; smaller ones
+# aren't worth the CPU time
+GZIP_MIN_BYTES = 4096
+
+# At most this much of an error response body is printed
+ERROR_BODY_MAX_BYTES = 4096
+
+
+# Environment variables checked, in order, for options not given on the command line
+_FALLBACKS = {
+    "pr_number": ("PR_NUMBER", "GITHUB_EVENT_NUMBER"),
+    "pr_sha": ("PR_SHA", "GITHUB_SHA"),
+    "target_branch": ("TARGET_BRANCH", "GITHUB_BASE_REF"),
+}
+
+
+def _env_fallback(env, option):
+    """Return the first non-empty environment variable listed for option."""
+    return next(filter(None, map(env.get, _FALLBACKS[option])), None)
 
-app = typer.Typer(help="Upload impacted targets to Trunk API")
+
+class _NdjsonBody:
+    """Streamed NDJSON request body: a header line, then one line per target.
+
+    Iterating always starts from the top, so the body can be re-sent when the
+    session's Retry policy retries the POST (a bare generator would be empty).
+    """
+
+    def __init__(self, header, targets):
+        self.header = header
+        self.targets = targets
+
+    def __iter__(self):
+        yield orjson.dumps(self.header) + b"\n"
+        for target in self.targets:
+            yield orjson.dumps({"target": target}) + b"\n"
 
 
 def eprint(*args, **kwargs):
@@ -22,47 +79,72 @@ def eprint(*args, **kwargs):
     print(*args, file=sys.stderr, **kwargs)
 
 
-@app.command()
-def main(
-    targets_file: str = typer.Option(
-        ...,
+def main():
+    """Upload impacted targets to Trunk API."""
+    parser = argparse.ArgumentParser(description="Upload impacted targets to Trunk API")
+    parser.add_argument(
         "--targets-file",
+        required=True,
         help="Path to JSON file containing impacted targets (array of strings)",
-    ),
-    trunk_token: Optional[str] = typer.Option(
-        None,
+    )
+    parser.add_argument(
         "--trunk-token",
-        envvar="TRUNK_TOKEN",
+        default=os.environ.get("TRUNK_TOKEN"),
         help="Trunk API token (or set TRUNK_TOKEN env var)",
-    ),
-    api_url: str = typer.Option(
-        "https://api.trunk.io:443/v1/setImpactedTargets",
+    )
+    parser.add_argument(
         "--api-url",
+        default="https://api.trunk.io:443/v1/setImpactedTargets",
         help="Trunk API URL",
-    ),
-    repository: Optional[str] = typer.Option(
-        None,
+    )
+    parser.add_argument(
         "--repository",
-        envvar="GITHUB_REPOSITORY",
+        default=os.environ.get("GITHUB_REPOSITORY"),
         help="Repository in format 'owner/name' (or set GITHUB_REPOSITORY env var)",
-    ),
-    pr_number: Optional[str] = typer.Option(
-        None,
+    )
+    parser.add_argument(
         "--pr-number",
         help="Pull request number (or set PR_NUMBER/GITHUB_EVENT_NUMBER env var)",
-    ),
-    pr_sha: Optional[str] = typer.Option(
-        None,
+    )
+    parser.add_argument(
         "--pr-sha",
         help="Pull request head SHA (or set PR_SHA/GITHUB_SHA env var)",
-    ),
-    target_branch: Optional[str] = typer.Option(
-        None,
+    )
+    parser.add_argument(
         "--target-branch",
         help="Target branch name (or set TARGET_BRANCH/GITHUB_BASE_REF env var)",
-    ),
-):
-    """Upload impacted targets to Trunk API."""
+    )
+    # A streamed NDJSON body is never compressed, so the two can't be combined
+    body_format = parser.add_mutually_exclusive_group()
+    body_format.add_argument(
+        "--gzip",
+        action="store_true",
+        help=f"Send request bodies over {GZIP_MIN_BYTES} bytes with "
+        "Content-Encoding: gzip. Requires server-side support.",
+    )
+    body_format.add_argument(
+        "--ndjson",
+        action="store_true",
+        help="Stream the upload as NDJSON (a header line, then one line per target) "
+        "with chunked transfer encoding instead of one JSON document. Requires "
+        "server-side support.",
+    )
+    parser.add_argument(
+        "--skip-empty",
+        action="store_true",
+        help="Exit without uploading when the targets array is empty. Only use this "
+        "if nothing relies on Trunk receiving an explicit empty upload for the PR.",
+    )
+    args = parser.parse_args()
+
+    targets_file = args.targets_file
+    trunk_token = args.trunk_token
+    api_url = args.api_url
+    repository = args.repository
+    pr_number = args.pr_number
+    pr_sha = args.pr_sha
+    target_branch = args.target_branch
+
     # Get token from arg or env
     if not trunk_token:
         eprint("Error: Trunk token required (--trunk-token or TRUNK_TOKEN env var)")
@@ -70,28 +152,31 @@ def main(
 
     # Read impacted targets
     try:
-        with open(targets_file, "r", encoding="utf-8") as f:
-            impacted_targets = json.load(f)
+        with open(targets_file, "rb") as f:
+            impacted_targets = orjson.loads(f.read())
         if not isinstance(impacted_targets, list):
             eprint(f"Error: Expected JSON array in {targets_file}")
             sys.exit(1)
+        # type() rather than isinstance(): JSON only yields exact str
+        if not all(type(x) is str for x in impacted_targets):
+            eprint("Error: impacted targets must be strings")
+            sys.exit(1)
+        if args.skip_empty and not impacted_targets:
+            print("No impacted targets; skipping upload.")
+            sys.exit(0)
     except FileNotFoundError:
         eprint(f"Error: Targets file not found: {targets_file}")
         sys.exit(1)
-    except json.JSONDecodeError as e:
+    except (orjson.JSONDecodeError, json.JSONDecodeError) as e:
         eprint(f"Error: Invalid JSON in targets file: {e}")
         sys.exit(1)
 
     # Get repository and PR information from args or environment variables
-    # (typer handles GITHUB_REPOSITORY, but we need to check multiple env vars for others)
-    if not pr_number:
-        pr_number = os.environ.get("PR_NUMBER") or os.environ.get("GITHUB_EVENT_NUMBER")
-    if not pr_sha:
-        pr_sha = os.environ.get("PR_SHA") or os.environ.get("GITHUB_SHA")
-    if not target_branch:
-        target_branch = os.environ.get("TARGET_BRANCH") or os.environ.get(
-            "GITHUB_BASE_REF"
-        )
+    # (argparse defaults cover GITHUB_REPOSITORY, but others check multiple env vars)
+    env = os.environ
+    pr_number = pr_number or _env_fallback(env, "pr_number")
+    pr_sha = pr_sha or _env_fallback(env, "pr_sha")
+    target_branch = target_branch or _env_fallback(env, "target_branch")
 
     # Parse repository owner and name
     if repository:
@@ -133,13 +218,23 @@ def main(
         "repo": {"host": "github.com", "owner": repo_owner, "name": repo_name},
         "pr": {"number": pr_number_int, "sha": pr_sha},
         "targetBranch": target_branch,
-        "impactedTargets": impacted_targets,
     }
 
-    # Make API request
-    headers = {"Content-Type": "application/json", "x-api-token": trunk_token}
+    # Make API request (serialize with orjson rather than requests' json.dumps)
+    headers = {"x-api-token": trunk_token}
+    if args.ndjson:
+        # An iterable body has no length, so requests sends it chunked
+        headers["Content-Type"] = "application/x-ndjson"
+        body = _NdjsonBody(post_body, impacted_targets)
+    else:
+        post_body["impactedTargets"] = impacted_targets
+        body = orjson.dumps(post_body)
+        if args.gzip and len(body) > GZIP_MIN_BYTES:
+            body = gzip.compress(body, compresslevel=6)
+            headers["Content-Encoding"] = "gzip"
     try:
-        response = requests.post(api_url, headers=headers, json=post_body, timeout=30)
+        with session:
+            response = session.post(api_url, headers=headers, data=body, timeout=30)
         http_status_code = response.status_code
     except requests.RequestException as e:
         eprint(f"HTTP request failed: {e}")
@@ -154,13 +249,22 @@ def main(
         sys.exit(0)
     else:
         eprint(f"❌ Failed to upload impacted targets. HTTP {http_status_code}")
-        try:
-            error_body = response.json()
-            eprint(f"Response: {json.dumps(error_body, indent=2)}")
-        except (ValueError, json.JSONDecodeError):
-            eprint(f"Response: {response.text}")
+        # Only parse bodies that claim to be JSON (not e.g. an HTML error page
+        # from a proxy), and cap what gets echoed into the CI log
+        ctype = response.headers.get("Content-Type", "").split(";")[0].strip()
+        error_body = response.content[:ERROR_BODY_MAX_BYTES]
+        if ctype == "application/json":
+            try:
+                pretty = orjson.dumps(
+                    orjson.loads(error_body), option=orjson.OPT_INDENT_2
+                ).decode()
+                eprint(f"Response: {pretty}")
+            except orjson.JSONDecodeError:
+                eprint(f"Response: {error_body.decode('utf-8', 'replace')}")
+        else:
+            eprint(f"Response ({ctype}): {error_body.decode('utf-8', 'replace')}")
         sys.exit(1)
 
 
 if __name__ == "__main__":
-    app()
+    main()
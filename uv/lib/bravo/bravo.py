@@ -2,7 +2,7 @@
 
 import common
 
-# Load words into a list
-WORDS = common.load_words_from_file("bravo.txt")
+# Load words into a WordList (memory-mapped, see common.WordList)
+WORDS = common.load_word_list("bravo.txt")
 
 __all__ = ["WORDS"]
@@ -2,7 +2,7 @@
 
 import common
 
-# Load words into a list
-WORDS = common.load_words_from_file("charlie.txt")
+# Load words into a WordList (memory-mapped, see common.WordList)
+WORDS = common.load_word_list("charlie.txt")
 
 __all__ = ["WORDS"]
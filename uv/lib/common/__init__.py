@@ -1,5 +1,5 @@
 """Common utilities for word list packages."""
 
-from .common import load_words_from_file
+from .common import WordList, lazy_words, load_word_list, load_words_from_file
 
-__all__ = ["load_words_from_file"]
+__all__ = ["WordList", "lazy_words", "load_word_list", "load_words_from_file"]
@@ -1,7 +1,180 @@
 """Common utilities for word list packages."""
 
 import inspect
+import mmap
 import os
+import re
+import sys
+from array import array
+from collections.abc import Sequence
+from itertools import accumulate, compress
+from operator import add
+
+# Lines end at "\n", "\r" or "\r\n", like reading the file in text mode
+_LINE_RE = re.compile(rb"[^\r\n]+")
+
+# Bytes a line can start or end with when it has surrounding whitespace: ASCII
+# whitespace, or any non-ASCII byte (part of a character such as U+00A0)
+_MAYBE_SPACE = frozenset(b" \t\x0b\x0c\x1c\x1d\x1e\x1f") | frozenset(range(0x80, 0x100))
+
+
+def _caller_frame(depth):
+    """Return the frame ``depth`` levels above the caller of this function."""
+    # Walk up directly: inspect.stack() builds FrameInfo (and reads source
+    # context) for every frame on the import stack, which dominated import time.
+    frame = inspect.currentframe()
+    if frame is None:
+        # No sys._getframe (which inspect.stack() needs too), so no fallback
+        raise RuntimeError("cannot locate the calling module: no stack frame support")
+    for _ in range(depth + 1):
+        frame = frame.f_back
+        if frame is None:
+            raise ValueError("call stack is not deep enough")
+    return frame
+
+
+def _read_words(txt_file):
+    """Read a one-word-per-line text file into a list."""
+    fd = os.open(txt_file, os.O_RDONLY)
+    try:
+        try:
+            mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # mmap cannot map an empty file; checking for that here instead of
+            # a separate fstat()/exists() keeps this to one open() per file
+            return []
+        try:
+            text = mm[:].decode("utf-8")
+        finally:
+            mm.close()
+    finally:
+        os.close(fd)
+    # Same rule as reading the file in text mode and stripping each line:
+    # lines end at "\n", "\r" or "\r\n" (not at the other separators
+    # str.splitlines() knows), and surrounding whitespace is not part of a word.
+    lines = text.replace("\r", "\n").split("\n")
+    # Intern so words repeated across lists share one str object; interned
+    # strings live for the whole process, so this is only for word lists.
+    # filter/map keep the per-word loop in C rather than in bytecode.
+    return list(map(sys.intern, filter(None, map(str.strip, lines))))
+
+
+def _index_words(mm):
+    """Return arrays of the start and end byte offsets of every word in mm.
+
+    Uses the same rule as _read_words: lines end at "\n", "\r" or "\r\n",
+    surrounding whitespace is stripped and blank lines are skipped. The third
+    value is True when every line is a bare word or blank, i.e. the words are
+    exactly the non-empty pieces of splitting the text on "\n".
+    """
+    text = mm[:].decode("utf-8")
+    if text.isascii() and "\r" not in text:
+        lines = text.split("\n")
+        if lines == list(map(str.strip, lines)):
+            # Common case: str offsets are byte offsets and no line needs
+            # stripping, so the offsets come from line lengths, all in C
+            lengths = list(map(len, lines))
+            line_starts = accumulate(map((1).__add__, lengths), initial=0)
+            starts = array("I", compress(line_starts, lengths))
+            ends = array("I", map(add, starts, filter(None, lengths)))
+            return starts, ends, True
+
+    starts = array("I")
+    ends = array("I")
+    for m in _LINE_RE.finditer(mm):
+        start, end = m.span()
+        if mm[start] in _MAYBE_SPACE or mm[end - 1] in _MAYBE_SPACE:
+            # Strip as str, then map the word back to byte offsets
+            line = mm[start:end].decode("utf-8")
+            word = line.strip()
+            if not word:
+                continue
+            start += len(line[: len(line) - len(line.lstrip())].encode("utf-8"))
+            end = start + len(word.encode("utf-8"))
+        starts.append(start)
+        ends.append(end)
+    return starts, ends, False
+
+
+class WordList(Sequence):
+    """Read-only sequence of the words in a one-word-per-line text file.
+
+    The file stays memory-mapped and only two uint32 offsets are kept per word;
+    a ``str`` is decoded each time a word is accessed. This uses far less
+    memory than a ``list[str]``, and the mapped pages are shared between
+    processes reading the same file. Words are split out by the same rule as
+    load_words_from_file, and a WordList compares equal to a list of the same
+    words.
+    """
+
+    __slots__ = ("_mm", "_starts", "_ends", "_plain", "_word_set")
+
+    def __init__(self, txt_file):
+        with open(txt_file, "rb") as f:
+            try:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # mmap cannot map an empty file
+                self._mm = b""
+        self._starts, self._ends, self._plain = _index_words(self._mm)
+        # Encoded words, built on the first membership test of a file that
+        # isn't plain
+        self._word_set = None
+
+    def __len__(self):
+        return len(self._starts)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self._decode(self._starts[index], self._ends[index]))
+        return self._mm[self._starts[index] : self._ends[index]].decode("utf-8")
+
+    def __contains__(self, word):
+        if not isinstance(word, str) or not word:
+            return False
+        try:
+            needle = word.encode("utf-8")
+        except UnicodeEncodeError:
+            return False
+        if not self._plain:
+            if self._word_set is None:
+                self._word_set = frozenset(
+                    map(self._mm.__getitem__, map(slice, self._starts, self._ends))
+                )
+            return needle in self._word_set
+        # Every line of a plain file is a bare word or blank, so a word is a
+        # match for a whole line: search for it with its line breaks, and
+        # check the first and last line (which lack one of them) separately
+        if b"\n" in needle:
+            return False
+        mm, n = self._mm, len(needle)
+        return (
+            mm.find(b"\n" + needle + b"\n") != -1
+            or mm[: n + 1] == needle + b"\n"
+            or mm[-n - 1 :] == b"\n" + needle
+            or (len(mm) == n and mm[:] == needle)
+        )
+
+    def __eq__(self, other):
+        if isinstance(other, (str, bytes, bytearray)) or not isinstance(
+            other, Sequence
+        ):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __iter__(self):
+        if self._plain:
+            # Re-splitting the whole file is several times faster than slicing
+            # out each word, at the cost of a temporary list while iterating
+            return filter(None, self._mm[:].decode("utf-8").split("\n"))
+        return self._decode(self._starts, self._ends)
+
+    def _decode(self, starts, ends):
+        # Chained map() so slicing and decoding every word runs in C
+        return map(bytes.decode, map(self._mm.__getitem__, map(slice, starts, ends)))
+
+    def __repr__(self):
+        return f"<WordList of {len(self)} words>"
 
 
 def load_words_from_file(txt_filename):
@@ -14,18 +187,56 @@ def load_words_from_file(txt_filename):
         List of words from the file
 
     The function finds the text file in the same directory as the calling module.
+    The file is memory-mapped and split in one pass, one word per line;
+    surrounding whitespace is stripped and blank lines are skipped.
     """
-    words = []
     # Get the directory where the calling module is located
     # This assumes the txt file is in the same directory as the calling module
-    caller_frame = inspect.stack()[1]
-    caller_file = caller_frame.filename
+    caller_file = _caller_frame(1).f_code.co_filename
     module_dir = os.path.dirname(caller_file)
+    return _read_words(os.path.join(module_dir, txt_filename))
+
+
+def load_word_list(txt_filename):
+    """Load words from a text file into a WordList.
+
+    Args:
+        txt_filename: Name of the text file (e.g., 'alpha.txt')
+
+    Returns:
+        WordList of the words in the file
+
+    Like load_words_from_file, the text file is looked up next to the calling
+    module.
+    """
+    caller_file = _caller_frame(1).f_code.co_filename
+    return WordList(os.path.join(os.path.dirname(caller_file), txt_filename))
+
+
+def lazy_words(txt_filename):
+    """Build a module ``__getattr__`` (PEP 562) that loads ``WORDS`` on first use.
+
+    Args:
+        txt_filename: Name of the text file (e.g., 'hotel.txt')
+
+    Returns:
+        A function to assign to the calling module's ``__getattr__``
+
+    Like load_words_from_file, the text file is looked up next to the calling
+    module, but it is only opened the first time ``module.WORDS`` is accessed.
+    The resulting WordList is then stored as a real module attribute.
+    """
+    module_globals = _caller_frame(1).f_globals
+    module_dir = os.path.dirname(module_globals["__file__"])
     txt_file = os.path.join(module_dir, txt_filename)
 
-    with open(txt_file, "r", encoding="utf-8") as f:
-        for line in f:
-            word = line.strip()
-            if word:
-                words.append(word)
-    return words
+    def __getattr__(name):
+        if name == "WORDS":
+            words = WordList(txt_file)
+            module_globals["WORDS"] = words
+            return words
+        raise AttributeError(
+            f"module {module_globals['__name__']!r} has no attribute {name!r}"
+        )
+
+    return __getattr__
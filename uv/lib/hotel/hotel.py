@@ -1,8 +1,12 @@
-"""Hotel word list module - loads words from hotel.txt."""
+"""Hotel word list module - loads words from hotel.txt on first use."""
 
 import common
 
-# Load words into a list
-WORDS = common.load_words_from_file("hotel.txt")
+# Load words into a WordList lazily, the first time WORDS is accessed
+__getattr__ = common.lazy_words("hotel.txt")
+
+# Declared for tools and type checkers only; no value is bound, so
+# __getattr__ still runs on first access
+WORDS: "common.WordList"
 
 __all__ = ["WORDS"]
@@ -1,8 +1,12 @@
-"""Indigo word list module - loads words from indigo.txt."""
+"""Indigo word list module - loads words from indigo.txt on first use."""
 
 import common
 
-# Load words into a list
-WORDS = common.load_words_from_file("indigo.txt")
+# Load words into a WordList lazily, the first time WORDS is accessed
+__getattr__ = common.lazy_words("indigo.txt")
+
+# Declared for tools and type checkers only; no value is bound, so
+# __getattr__ still runs on first access
+WORDS: "common.WordList"
 
 __all__ = ["WORDS"]
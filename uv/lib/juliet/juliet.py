@@ -1,8 +1,12 @@
-"""Juliet word list module - loads words from juliet.txt."""
+"""Juliet word list module - loads words from juliet.txt on first use."""
 
 import common
 
-# Load words into a list
-WORDS = common.load_words_from_file("juliet.txt")
+# Load words into a WordList lazily, the first time WORDS is accessed
+__getattr__ = common.lazy_words("juliet.txt")
+
+# Declared for tools and type checkers only; no value is bound, so
+# __getattr__ still runs on first access
+WORDS: "common.WordList"
 
 __all__ = ["WORDS"]
@@ -1,8 +1,12 @@
-"""Kilo word list module - loads words from kilo.txt."""
+"""Kilo word list module - loads words from kilo.txt on first use."""
 
 import common
 
-# Load words into a list
-WORDS = common.load_words_from_file("kilo.txt")
+# Load words into a WordList lazily, the first time WORDS is accessed
+__getattr__ = common.lazy_words("kilo.txt")
+
+# Declared for tools and type checkers only; no value is bound, so
+# __getattr__ still runs on first access
+WORDS: "common.WordList"
 
 __all__ = ["WORDS"]